@@ -1,7 +1,8 @@
 import streamlit as st
-import plotly.graph_objects as go
+import plotly.express as px
 import pandas as pd
-from typing import Union, Optional, Dict
+import numpy as np
+from fire_core import parse_currency, format_currency, calculate_retirement, find_sustainable_value
 
 # Set page configuration
 st.set_page_config(
@@ -10,36 +11,15 @@ st.set_page_config(
     page_icon="💰"
 )
 
-# Custom CSS for styling
-st.markdown("""
+# Custom CSS for styling; colors come from the theme in .streamlit/config.toml
+CUSTOM_CSS = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Nunito:wght@300;400;600&family=Quicksand:wght@400;600&display=swap');
 
     body {
         font-family: 'Nunito', sans-serif;
     }
-    .main {
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
-    .sidebar .sidebar-content {
-        background-color: var(--secondary-background-color);
-        color: var(--text-color);
-    }
-    .sidebar .sidebar-content .stTextInput, .sidebar .sidebar-content .stSlider {
-        color: var(--text-color);
-    }
-    .sidebar .sidebar-content .stTextInput input, .sidebar .sidebar-content .stSlider .stSliderLabel {
-        color: var(--text-color);
-    }
-    .sidebar .sidebar-content .stTextInput input {
-        background-color: var(--input-background-color);
-        border: 1px solid #4CAF50;
-    }
     .stButton>button {
-        background-color: #4CAF50;
-        color: white;
-        border: none;
         padding: 10px 24px;
         text-align: center;
         text-decoration: none;
@@ -49,9 +29,6 @@ st.markdown("""
         cursor: pointer;
         border-radius: 12px;
     }
-    .stButton>button:hover {
-        background-color: #45a049;
-    }
     .stAlert {
         border-radius: 12px;
     }
@@ -80,88 +57,9 @@ st.markdown("""
     .stTable th, .stTable td {
         padding: 10px;
     }
-    .stTable th {
-        background-color: var(--secondary-background-color);
-        color: var(--text-color);
-    }
-    .stTable td {
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
-    .stTable tr:nth-child(even) td {
-        background-color: var(--secondary-background-color);
-    }
-    .stTable tr:nth-child(odd) td {
-        background-color: var(--background-color);
-    }
     </style>
-""", unsafe_allow_html=True)
-
-# Helper functions
-def parse_currency(value: Union[str, int, float]) -> Optional[float]:
-    if isinstance(value, (int, float)):
-        return value
-    value = value.replace('$', '').replace(',', '')
-    try:
-        return float(value)
-    except ValueError:
-        return None
-
-def format_currency(value: float) -> str:
-    return f"${value:,.2f}"
-
-def calculate_retirement(initial_capital, annual_expenses, years, return_rate, inflation_rate):
-    capital = [initial_capital]
-    expenses = [annual_expenses]
-    withdrawal_rates = [annual_expenses / initial_capital * 100]
-    
-    for year in range(1, years + 1):
-        # Calculate current expenses with inflation
-        current_expenses = expenses[-1] * (1 + inflation_rate / 100)
-        
-        # Total expenses are just the current expenses
-        total_expenses = current_expenses
-        expenses.append(total_expenses)
-        
-        # Calculate growth of the capital
-        growth = capital[-1] * (return_rate / 100)
-        
-        # Calculate new capital after growth and expenses
-        new_capital = capital[-1] + growth - total_expenses
-        capital.append(max(0, new_capital))
-        
-        # Calculate withdrawal rate
-        withdrawal_rates.append(total_expenses / capital[-2] * 100 if capital[-2] > 0 else float('inf'))
-        
-        # Break if capital is depleted
-        if new_capital <= 0:
-            break
-    
-    return capital, expenses, withdrawal_rates
-
-def find_sustainable_value(years, annual_expenses, return_rate, inflation_rate, find_capital, initial_capital):
-    if find_capital:
-        # Find the required initial capital for the given period
-        low, high = 0, initial_capital * 10
-        while low < high:
-            mid = (low + high) / 2
-            capital, _, _ = calculate_retirement(mid, annual_expenses, years, return_rate, inflation_rate)
-            if capital[-1] > 0:
-                high = mid
-            else:
-                low = mid + 1
-        return low
-    else:
-        # Find the maximum sustainable annual expenses for the given period
-        low, high = 0, annual_expenses * 10
-        while low < high:
-            mid = (low + high) / 2
-            capital, _, _ = calculate_retirement(initial_capital, mid, years, return_rate, inflation_rate)
-            if capital[-1] > 0:
-                low = mid + 1
-            else:
-                high = mid
-        return high
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Summary section
 st.title("💰 Retirement Withdrawal Calculator")
@@ -172,12 +70,31 @@ This calculator helps you estimate how long your retirement savings will last ba
 # Input section
 st.sidebar.header("Input Parameters")
 
-# Initial Capital Input
-initial_capital_input = st.sidebar.text_input(
-    'Initial Capital',
-    value=format_currency(1000000),  # Default value formatted
-    help="Enter the initial capital amount. You can use dollar signs and commas."
-)
+# Inputs are batched in a form so the results only recompute once per submit
+with st.sidebar.form("inputs"):
+    # Initial Capital Input
+    initial_capital_input = st.text_input(
+        'Initial Capital',
+        value=format_currency(1000000),  # Default value formatted
+        help="Enter the initial capital amount. You can use dollar signs and commas."
+    )
+
+    # Annual Expenses Input
+    annual_expenses_input = st.text_input(
+        'Annual Expenses',
+        value=format_currency(40000),  # Default value formatted
+        help="Enter your annual expenses. You can use dollar signs and commas."
+    )
+
+    # Round to the slider step so float noise from the browser doesn't miss the cache
+    return_rate = round(st.slider('Expected Annual Return (%)', 0.0, 15.0, 10.0, 0.1, help="The expected annual return on your investments."), 1)
+    inflation_rate = round(st.slider('Expected Annual Inflation (%)', 0.0, 10.0, 3.8, 0.1, help="The expected annual inflation rate."), 1)
+
+    # Number of Years Input
+    years = st.slider('Number of Years to Simulate', 1, 100, 30, help="The number of years to simulate.")
+
+    st.form_submit_button("Update", type="primary")
+
 initial_capital = parse_currency(initial_capital_input)
 if initial_capital is None:
     st.sidebar.error("Please enter a valid dollar amount for Initial Capital")
@@ -186,12 +103,6 @@ else:
     # Reformat the input to display it correctly
     initial_capital_input = format_currency(initial_capital)
 
-# Annual Expenses Input
-annual_expenses_input = st.sidebar.text_input(
-    'Annual Expenses',
-    value=format_currency(40000),  # Default value formatted
-    help="Enter your annual expenses. You can use dollar signs and commas."
-)
 annual_expenses = parse_currency(annual_expenses_input)
 if annual_expenses is None:
     st.sidebar.error("Please enter a valid dollar amount for Annual Expenses")
@@ -200,12 +111,6 @@ else:
     # Reformat the input to display it correctly
     annual_expenses_input = format_currency(annual_expenses)
 
-return_rate = st.sidebar.slider('Expected Annual Return (%)', 0.0, 15.0, 10.0, 0.1, help="The expected annual return on your investments.")
-inflation_rate = st.sidebar.slider('Expected Annual Inflation (%)', 0.0, 10.0, 3.8, 0.1, help="The expected annual inflation rate.")
-
-# Number of Years Input
-years = st.sidebar.slider('Number of Years to Simulate', 1, 100, 30, help="The number of years to simulate.")
-
 # Calculation
 capital_over_time, expenses_over_time, withdrawal_rates = calculate_retirement(initial_capital, annual_expenses, years, return_rate, inflation_rate)
 
@@ -213,25 +118,33 @@ capital_over_time, expenses_over_time, withdrawal_rates = calculate_retirement(i
 st.header("Results")
 
 # Plot
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=list(range(len(capital_over_time))), y=capital_over_time, mode='lines', name='Capital'))
-fig.add_trace(go.Scatter(x=list(range(len(expenses_over_time))), y=expenses_over_time, mode='lines', name='Annual Expenses'))
-fig.update_layout(title='Projected Capital, Expenses, and Withdrawals Over Time', xaxis_title='Years', yaxis_title='Amount ($)', height=500, plot_bgcolor='var(--background-color)', paper_bgcolor='var(--background-color)', font=dict(color='var(--text-color)'))
+plot_df = pd.DataFrame({
+    'Year': np.arange(len(capital_over_time)),
+    'Capital': capital_over_time,
+    'Annual Expenses': expenses_over_time
+})
+fig = px.line(plot_df.melt('Year', var_name='Series', value_name='Amount'), x='Year', y='Amount', color='Series', render_mode='webgl')
+fig.update_layout(title='Projected Capital, Expenses, and Withdrawals Over Time', xaxis_title='Years', yaxis_title='Amount ($)', legend_title_text='', height=500, plot_bgcolor='var(--background-color)', paper_bgcolor='var(--background-color)', font=dict(color='var(--text-color)'))
 st.plotly_chart(fig, use_container_width=True, config={'staticPlot': True})
 
 # Table
 intervals = list(range(0, years + 1))  # Create a list of years from 0 to the specified number of years
-data = {
+# Years past depletion are missing from the results and show up as N/A
+df = pd.DataFrame({
     'Year': intervals,
-    'Remaining Capital': [f'${capital_over_time[year]:,.2f}' if year < len(capital_over_time) else 'N/A' for year in intervals],
-    'Annual Expenses': [f'${expenses_over_time[year]:,.2f}' if year < len(expenses_over_time) else 'N/A' for year in intervals],
-    'Withdrawal Rate': [f'{withdrawal_rates[year]:.2f}%' if year < len(withdrawal_rates) else 'N/A' for year in intervals]
-}
-df = pd.DataFrame(data)
+    'Remaining Capital': pd.Series(capital_over_time).reindex(intervals),
+    'Annual Expenses': pd.Series(expenses_over_time).reindex(intervals),
+    'Withdrawal Rate': pd.Series(withdrawal_rates).reindex(intervals)
+})
+styler = df.style.format({
+    'Remaining Capital': '${:,.2f}',
+    'Annual Expenses': '${:,.2f}',
+    'Withdrawal Rate': '{:.2f}%'
+}, na_rep='N/A').hide(axis='index')
 
 # Convert DataFrame to HTML and display it using st.markdown
 st.markdown(
-    df.to_html(index=False, escape=False),
+    styler.to_html(),
     unsafe_allow_html=True
 )
 
@@ -255,11 +168,11 @@ else:
     st.success(f'✅ Capital lasts for the entire {years} year period.')
     
     # Calculate remaining capital after the specified number of years
-    final_capital = capital_over_time[-1]
+    final_capital = float(capital_over_time[-1])
     st.info(f'💡 Remaining capital after {years} years: ${final_capital:,.2f}')
     
     # Calculate total withdrawals over the specified number of years
-    total_withdrawals = sum(expenses_over_time)
+    total_withdrawals = float(expenses_over_time.sum())
     st.info(f'💡 Total withdrawals over {years} years: ${total_withdrawals:,.2f}')
 
 # Perpetuity calculations
@@ -0,0 +1,74 @@
+import functools
+import streamlit as st
+import numpy as np
+from typing import Union, Optional
+
+_CURRENCY_STRIP = str.maketrans('', '', '$,')
+
+@functools.lru_cache(maxsize=64)
+def _parse_currency_str(value: str) -> Optional[float]:
+    try:
+        return float(value.translate(_CURRENCY_STRIP))
+    except ValueError:
+        return None
+
+def parse_currency(value: Union[str, int, float]) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return value
+    # Text inputs keep the same string across reruns, so parse each one only once
+    return _parse_currency_str(value)
+
+def format_currency(value: float) -> str:
+    return f"${value:,.2f}"
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def calculate_retirement(initial_capital, annual_expenses, years, return_rate, inflation_rate):
+    # Growth and inflation factors are constant, so every series is geometric in the year index
+    growth = 1 + return_rate / 100
+    inflation = 1 + inflation_rate / 100
+    t = np.arange(years + 1)
+    growth_t = growth ** t
+    inflation_t = inflation ** t
+
+    # Expenses for each year, with inflation
+    expenses = annual_expenses * inflation_t
+
+    # Closed-form solution of capital[t] = capital[t-1] * growth - expenses[t]
+    if growth == inflation:
+        withdrawn = annual_expenses * t * inflation_t
+    else:
+        withdrawn = annual_expenses * inflation * (growth_t - inflation_t) / (growth - inflation)
+    capital = initial_capital * growth_t - withdrawn
+
+    # Truncate at the first year the capital is depleted
+    depleted = capital[1:] <= 0
+    if depleted.any():
+        last_year = int(np.argmax(depleted)) + 1
+        capital = capital[:last_year + 1]
+        expenses = expenses[:last_year + 1]
+        capital[-1] = 0
+
+    # Withdrawal rate relative to the capital at the start of each year
+    withdrawal_rates = np.empty_like(capital)
+    withdrawal_rates[0] = annual_expenses / initial_capital * 100
+    withdrawal_rates[1:] = expenses[1:] / capital[:-1] * 100
+
+    return capital, expenses, withdrawal_rates
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def find_sustainable_value(years, annual_expenses, return_rate, inflation_rate, find_capital, initial_capital):
+    # Present value of one dollar of initial expenses spent every year for the given period.
+    # Capital at the end of the period is linear in both initial capital and expenses,
+    # so the break-even value is a single division.
+    ratio = (1 + inflation_rate / 100) / (1 + return_rate / 100)
+    if ratio == 1:
+        expense_factor = years
+    else:
+        expense_factor = ratio * (1 - ratio ** years) / (1 - ratio)
+
+    if find_capital:
+        # Required initial capital for the given period
+        return annual_expenses * expense_factor
+    else:
+        # Maximum sustainable annual expenses for the given period
+        return initial_capital / expense_factor